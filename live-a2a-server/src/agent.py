@@ -6,17 +6,19 @@ pathway analysis, and hypothesis synthesis. Each agent is designed to perform sp
 biomedical data tasks using CrewAI and integrates with external tools and APIs.
 """
 
+import asyncio
 import os
 import logging
+from functools import lru_cache
 
+import litellm
 from crewai import LLM, Agent, Crew, Task
 from crewai.process import Process
 from dotenv import load_dotenv
 from tools import (
-    pubmed_tool,
+    pubmed_search_async,
     query_live_database,
-    google_scholar_tool,
-    get_user_personal_data,
+    google_scholar_search_async,
 )
 
 
@@ -24,6 +26,81 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+# Static Judge prompt text. Kept at module level so the prompt prefix sent to
+# the provider is byte-identical across calls; only the trailing
+# request/evidence section of the task varies. At about 600 tokens it is below
+# the providers' 1024-token minimum for prefix caching.
+JUDGE_ROLE = "Judge Agent"
+JUDGE_GOAL = "Assess the reliability and biological relevance of studies or datasets about longevity interventions such as drugs, diets, or therapies. Produce a concise, natural-language summary that addresses the question and follows scientific evaluation criteria."
+JUDGE_BACKSTORY = (
+    "You are the Judge Agent, a scientific evaluator specializing in longevity and aging research. Your task is to assess the reliability and biological relevance of studies or datasets about longevity interventions such as drugs, diets, or therapies.\n"
+    "Instructions: Evaluate the study based on study design quality (controls, sample size, replicates), intervention parameters (dosage, duration, administration, side effects), outcome reliability (lifespan or healthspan effects, statistical significance, reproducibility), biological relevance, and source integrity (peer review, transparency, data availability).\n"
+    "Consistency Check – Compare results, dosages, or effects across multiple studies. If multiple studies report similar findings, confidence in the results is higher.\n"
+    "Source Reliability – Assess the credibility of the publication or database (peer review, funding transparency, conflict of interest, data availability).\n"
+    "Experimental Model – Consider the model organism used and how well results may translate to humans.\n"
+    "Reproducibility Evidence – Evaluate whether the results have been replicated in independent studies. Flag findings that appear in a single study without support.\n"
+    "Statistics – Check for proper statistical reporting, significance (p-values, effect sizes), and robustness of conclusions.\n"
+    "Additional Guidance: Summarize the most consistent evidence-supported dosage or effect range rather than picking a single number if values vary across studies. Provide a clear, plain-language summary as if explaining the credibility and key findings to someone with scientific background but not familiar with the specific study. If critical information is missing, mention it clearly.\n"
+    "Behavior Instructions: Be objective, data-driven, and biologically grounded. If critical data is missing or unclear, explicitly note 'insufficient data for evaluation'. Compare findings across studies when possible and reason based on biological logic, known longevity mechanisms, and reproducibility of results."
+)
+JUDGE_TASK_INSTRUCTIONS = (
+    "Evidence for the request below has already been gathered from the LIVE database, PubMed and Google Scholar. Base your evaluation on that evidence; if a source returned an error or no results, treat it as missing.\n"
+    "Given input from the Automation Agent or a user query, produce a concise, natural-language response or summary that addresses the question.\n"
+    "Evaluate the study or dataset using the following criteria: Consistency Check, Source Reliability, Experimental Model, Reproducibility Evidence, and Statistics.\n"
+    "Summarize the most consistent evidence-supported dosage or effect range if values vary.\n"
+    "If critical information is missing, mention it clearly as 'insufficient data for evaluation'.\n"
+    "Be objective, data-driven, and biologically grounded.\n\n"
+)
+JUDGE_TASK_DESCRIPTION = (
+    JUDGE_TASK_INSTRUCTIONS
+    + "Request: {intervention_data}\n\nGathered evidence:\n{evidence}"
+)
+JUDGE_EXPECTED_OUTPUT = "A clear, plain-language summary of the reliability and biological relevance of the intervention or study, including evidence, key findings, and any missing data."
+
+# Streaming messages rendered once at import; a request only fills in the
+# inputs between the frozen instructions and the expected-output criteria.
+JUDGE_SYSTEM_PROMPT = (
+    f"You are {JUDGE_ROLE}. {JUDGE_BACKSTORY}\nYour personal goal is: {JUDGE_GOAL}"
+)
+JUDGE_TASK_SUFFIX = (
+    "\n\nThis is the expected criteria for your final answer: " + JUDGE_EXPECTED_OUTPUT
+)
+
+# Sentence-length requests match nothing on PubMed, which ANDs every term,
+# so the literature sources are searched with a condensed keyword query.
+JUDGE_SEARCH_QUERY_PROMPT = (
+    "Turn the user's request into a literature search query for PubMed and Google Scholar. "
+    "Reply only with the query: at most 6 keywords naming the interventions, organisms "
+    "and outcomes involved, without boolean operators or quotes."
+)
+
+
+def _completion_params(llm: LLM) -> dict:
+    """litellm keyword arguments equivalent to a configured crewai LLM."""
+    params = {
+        "model": llm.model,
+        "api_key": llm.api_key,
+        "temperature": llm.temperature,
+        "max_completion_tokens": llm.max_completion_tokens,
+        **(llm.additional_params or {}),
+    }
+    return {key: value for key, value in params.items() if value is not None}
+
+
+@lru_cache(maxsize=1)
+def get_judge_llm() -> LLM:
+    """Return the Judge LLM for the configured provider, built once per process."""
+    if os.getenv("GOOGLE_GENAI_USE_VERTEXAI"):
+        return LLM(model="gemini/gemini-2.5-flash")
+    if os.getenv("GOOGLE_API_KEY"):
+        return LLM(
+            model="gemini/gemini-2.5-flash",
+            api_key=os.getenv("GOOGLE_API_KEY"),
+            max_completion_tokens=5000,
+        )
+    return LLM(model="gpt-4o")
+
+
 class JudgeAgent:
     """
     Agent-as-a-Judge: Verifies the integrity and accuracy of interventions.
@@ -34,48 +111,18 @@ class JudgeAgent:
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
     def __init__(self):
-        if os.getenv("GOOGLE_GENAI_USE_VERTEXAI"):
-            self.model = LLM(model="gemini/gemini-2.5-flash")
-        elif os.getenv("GOOGLE_API_KEY"):
-            self.model = LLM(
-                model="gemini/gemini-2.5-flash",
-                api_key=os.getenv("GOOGLE_API_KEY"),
-                max_completion_tokens=5000,
-            )
-        else:
-            self.model = LLM(model="gpt-4o")
+        self.model = get_judge_llm()
         self.judge_agent = Agent(
-            role="Judge Agent",
-            goal="Assess the reliability and biological relevance of studies or datasets about longevity interventions such as drugs, diets, or therapies. Produce a concise, natural-language summary that addresses the question and follows scientific evaluation criteria.",
-            backstory=(
-                "You are the Judge Agent, a scientific evaluator specializing in longevity and aging research. Your task is to assess the reliability and biological relevance of studies or datasets about longevity interventions such as drugs, diets, or therapies.\n"
-                "Instructions: Evaluate the study based on study design quality (controls, sample size, replicates), intervention parameters (dosage, duration, administration, side effects), outcome reliability (lifespan or healthspan effects, statistical significance, reproducibility), biological relevance, and source integrity (peer review, transparency, data availability).\n"
-                "Consistency Check – Compare results, dosages, or effects across multiple studies. If multiple studies report similar findings, confidence in the results is higher.\n"
-                "Source Reliability – Assess the credibility of the publication or database (peer review, funding transparency, conflict of interest, data availability).\n"
-                "Experimental Model – Consider the model organism used and how well results may translate to humans.\n"
-                "Reproducibility Evidence – Evaluate whether the results have been replicated in independent studies. Flag findings that appear in a single study without support.\n"
-                "Statistics – Check for proper statistical reporting, significance (p-values, effect sizes), and robustness of conclusions.\n"
-                "Additional Guidance: Summarize the most consistent evidence-supported dosage or effect range rather than picking a single number if values vary across studies. Provide a clear, plain-language summary as if explaining the credibility and key findings to someone with scientific background but not familiar with the specific study. If critical information is missing, mention it clearly.\n"
-                "Behavior Instructions: Be objective, data-driven, and biologically grounded. If critical data is missing or unclear, explicitly note 'insufficient data for evaluation'. Compare findings across studies when possible and reason based on biological logic, known longevity mechanisms, and reproducibility of results."
-            ),
+            role=JUDGE_ROLE,
+            goal=JUDGE_GOAL,
+            backstory=JUDGE_BACKSTORY,
             verbose=False,
             allow_delegation=False,
-            tools=[pubmed_tool, google_scholar_tool, query_live_database],
             llm=self.model,
-            max_steps=2
         )
         self.judge_task = Task(
-            description=(
-                "If you are given input for an Longevity intervention but no specific scientific papers or datasets search on the LIVE database for relevant studies and after that search each studies on PubMed.\n"
-                "Given input from the Automation Agent or a user query, produce a concise, natural-language response or summary that addresses the question.\n"
-                "Evaluate the study or dataset using the following criteria: Consistency Check, Source Reliability, Experimental Model, Reproducibility Evidence, and Statistics.\n"
-                "Summarize the most consistent evidence-supported dosage or effect range if values vary.\n"
-                "If critical information is missing, mention it clearly as 'insufficient data for evaluation'.\n"
-                "Be objective, data-driven, and biologically grounded."
-            ),
-            expected_output=(
-                "A clear, plain-language summary of the reliability and biological relevance of the intervention or study, including evidence, key findings, and any missing data."
-            ),
+            description=JUDGE_TASK_DESCRIPTION,
+            expected_output=JUDGE_EXPECTED_OUTPUT,
             agent=self.judge_agent,
         )
         self.crew = Crew(
@@ -85,12 +132,195 @@ class JudgeAgent:
             verbose=False,
         )
 
+    async def search_query(self, intervention_data):
+        """
+        Condense the request into a short keyword query for the literature
+        sources, falling back to the request itself if the model call fails.
+        """
+        params = {
+            **_completion_params(self.model),
+            "temperature": 0,
+            "max_completion_tokens": 60,
+        }
+        if "gemini" in self.model.model:
+            # Gemini 2.5 thinks by default and thinking tokens count against
+            # the output cap, which would leave no room for the query itself.
+            params["reasoning_effort"] = "disable"
+        try:
+            response = await litellm.acompletion(
+                messages=[
+                    {"role": "system", "content": JUDGE_SEARCH_QUERY_PROMPT},
+                    {"role": "user", "content": intervention_data},
+                ],
+                **params,
+            )
+            query = (response.choices[0].message.content or "").strip().strip('"')
+        except Exception as e:
+            logger.error(f"Error deriving search query: {e}")
+            return intervention_data
+        if not query:
+            logger.warning("Empty search query from the model, using the request.")
+            return intervention_data
+        return query
+
+    async def gather_evidence(self, intervention_data):
+        """
+        Query the LIVE database, PubMed and Google Scholar concurrently.
+
+        The LIVE database answers the request as written; PubMed and Google
+        Scholar are searched with the keyword query from search_query, derived
+        while the LIVE lookup is already running, with PubMed abstracts included
+        so study quality can be judged. PubMed is fetched with native async
+        HTTP; the LIVE database and Google Scholar are blocking and run in
+        worker threads. A failing source is reported inline rather than
+        aborting the others.
+
+        Args:
+            intervention_data (str): The request to gather evidence for.
+
+        Returns:
+            str: The evidence from every source, one section per source.
+        """
+        live_lookup = asyncio.ensure_future(
+            asyncio.to_thread(query_live_database.run, question=intervention_data)
+        )
+        query = await self.search_query(intervention_data)
+        sources = {
+            "LIVE Database": live_lookup,
+            "PubMed": pubmed_search_async(query, include_abstracts=True),
+            "Google Scholar": google_scholar_search_async(query),
+        }
+        results = await asyncio.gather(*sources.values(), return_exceptions=True)
+        sections = [f"Literature search query: {query}"]
+        for name, result in zip(sources, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error gathering evidence from {name}: {result}")
+                result = f"Error querying {name}: {result}"
+            sections.append(f"### {name}\n{result}")
+        return "\n\n".join(sections)
+
+    async def ainvoke(self, intervention_data, session_id):
+        evidence = await self.gather_evidence(intervention_data)
+        inputs = {
+            "intervention_data": intervention_data,
+            "evidence": evidence,
+            "session_id": session_id,
+        }
+        # Kickoff interpolates inputs into the shared task, so concurrent
+        # requests each run on their own copy of the crew.
+        return await self.crew.copy().kickoff_async(inputs=inputs)
+
     def invoke(self, intervention_data, session_id):
-        inputs = {"intervention_data": intervention_data, "session_id": session_id}
-        return self.crew.kickoff(inputs)
+        return asyncio.run(self.ainvoke(intervention_data, session_id))
 
-    async def stream(self, intervention_data: dict):
-        raise NotImplementedError("Streaming is not supported by CrewAI.")
+    async def kickoff_batch(self, intervention_data_list, session_id):
+        """
+        Evaluate several requests concurrently.
+
+        Args:
+            intervention_data_list (list[str]): The requests to evaluate.
+            session_id (str): The session identifier.
+
+        Returns:
+            list: One crew output per request, in input order.
+        """
+        evidence_list = await asyncio.gather(
+            *(self.gather_evidence(data) for data in intervention_data_list)
+        )
+        inputs = [
+            {
+                "intervention_data": data,
+                "evidence": evidence,
+                "session_id": session_id,
+            }
+            for data, evidence in zip(intervention_data_list, evidence_list)
+        ]
+        return await self.crew.kickoff_for_each_async(inputs=inputs)
+
+    async def stream(self, intervention_data, session_id):
+        """
+        Evaluate a request and yield the answer as it is generated.
+
+        CrewAI kickoff cannot stream, so after the evidence is gathered the
+        single synthesis call goes to the model directly, with the same
+        prompts the crew would send.
+
+        Args:
+            intervention_data (str): The request to evaluate.
+            session_id (str): The session identifier.
+
+        Yields:
+            str: Consecutive chunks of the answer text.
+        """
+        evidence = await self.gather_evidence(intervention_data)
+        messages = [
+            {"role": "system", "content": JUDGE_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": (
+                    JUDGE_TASK_INSTRUCTIONS
+                    + f"Request: {intervention_data}\n\nGathered evidence:\n{evidence}"
+                    + JUDGE_TASK_SUFFIX
+                ),
+            },
+        ]
+        response = await litellm.acompletion(
+            messages=messages, stream=True, **_completion_params(self.model)
+        )
+        async for chunk in response:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if text:
+                yield text
+
+
+LIVE_DISCLAIMER = "This is not medical advice. Consult a medical professional."
+LIVE_MAX_COMPLETION_TOKENS = 1200
+# One-shot classifier deciding whether a question needs the crew at all
+LIVE_ROUTER_PROMPT = (
+    "Classify the user's question about longevity interventions. "
+    'Reply only with JSON: {"complexity": "simple"} if it is a single factual lookup in the LIVE database '
+    "(for example the dosage, studies or link of one named intervention), "
+    'otherwise {"complexity": "complex"}.'
+)
+# Questions longer than this are never single lookups; they skip the router
+LIVE_ROUTER_MAX_WORDS = 25
+# The fast path bypasses the crew task, so it carries the task's answer rules
+LIVE_FAST_PATH_INSTRUCTIONS = (
+    "Answer only from the database content in <=200 words. Cite the studies with "
+    "their LIVE database or article URLs and clarify if the evidence is clinical, "
+    "trial, or animal-based."
+)
+
+
+@lru_cache(maxsize=1)
+def get_live_llms() -> tuple[LLM, LLM]:
+    """Return the LIVE answer and router LLMs, built once per process."""
+    if os.getenv("GOOGLE_GENAI_USE_VERTEXAI"):
+        return (
+            LLM(
+                model="gemini-2.5-flash",
+                max_completion_tokens=LIVE_MAX_COMPLETION_TOKENS,
+            ),
+            LLM(model="gemini-2.5-flash-lite", temperature=0, max_completion_tokens=20),
+        )
+    if os.getenv("GOOGLE_API_KEY"):
+        return (
+            LLM(
+                model="gemini/gemini-2.5-flash",
+                api_key=os.getenv("GOOGLE_API_KEY"),
+                max_completion_tokens=LIVE_MAX_COMPLETION_TOKENS,
+            ),
+            LLM(
+                model="gemini/gemini-2.5-flash-lite",
+                api_key=os.getenv("GOOGLE_API_KEY"),
+                temperature=0,
+                max_completion_tokens=20,
+            ),
+        )
+    return (
+        LLM(model="gpt-4o"),
+        LLM(model="gpt-4o-mini", temperature=0, max_completion_tokens=20),
+    )
 
 
 class LiveAgent:
@@ -102,29 +332,23 @@ class LiveAgent:
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
     def __init__(self):
-        if os.getenv("GOOGLE_GENAI_USE_VERTEXAI"):
-            self.model = LLM(model="gemini-2.5-flash")
-        elif os.getenv("GOOGLE_API_KEY"):
-            self.model = LLM(
-                model="gemini/gemini-2.5-flash",
-                api_key=os.getenv("GOOGLE_API_KEY"),
-                max_completion_tokens=5000,
-            )
-        else:
-            self.model = LLM(model="gpt-4o")
+        self.model, self.router_model = get_live_llms()
         self.live_agent = Agent(
             role="Longevity Intervention Expert",
             goal="Answer any question about healthy and longevity interventions, cite studies, and restrict answers to LIVE database content.",
             backstory="You are an expert agent for longevity interventions. You answer questions strictly based on the Longevity Interventions database, PubMed, and personal health data. You always cite which study is good, warn that this is not medical advice, and clarify if the evidence is clinical, trial, or animal-based.",
             verbose=False,
             allow_delegation=False,
-            tools=[ query_live_database],
+            tools=[query_live_database],
             llm=self.model,
-            max_steps=3
+            max_iter=2,
         )
         self.live_task = Task(
             description=(
-                "Respond to questions about healthy and longevity interventions using only database content. Cite studies, provide a summary of possible interventions, and include links or urls either LIVE database or article. Always warn: 'This is not medical advice. Consult a medical professional.' Clarify if evidence is clinical, trial, or animal-based."
+                "Respond to questions about healthy and longevity interventions using only database content. Cite studies, provide a summary of possible interventions, and include links or urls either LIVE database or article. "
+                f"Always warn: '{LIVE_DISCLAIMER}' Clarify if evidence is clinical, trial, or animal-based. "
+                "Respond in <=200 words.\n\n"
+                "Question: {user_query}"
             ),
             expected_output=(
                 "A summary of possible longevity interventions, with study citations and links. Includes required warnings."
@@ -138,29 +362,62 @@ class LiveAgent:
             verbose=False,
         )
 
-    def invoke(self, question, session_id):
+    def classify(self, question):
+        """
+        Ask the router model whether the question is a single database lookup.
+
+        Returns:
+            str: "simple" or "complex"; "complex" whenever the router fails.
+        """
+        try:
+            reply = self.router_model.call(
+                [
+                    {"role": "system", "content": LIVE_ROUTER_PROMPT},
+                    {"role": "user", "content": question},
+                ]
+            )
+        except Exception as e:
+            logger.warning(f"Router call failed, using the full crew: {e}")
+            return "complex"
+        return "simple" if '"simple"' in str(reply) else "complex"
+
+    async def ainvoke(self, question, session_id):
+        # Simple lookups skip the crew and are answered by the LIVE database
+        # tool directly, saving the agent's reasoning and tool-call round trips.
+        if (
+            len(question.split()) <= LIVE_ROUTER_MAX_WORDS
+            and await asyncio.to_thread(self.classify, question) == "simple"
+        ):
+            logger.info("Simple question, querying the LIVE database directly.")
+            answer = await asyncio.to_thread(
+                query_live_database.run,
+                question=f"{question}\n\n{LIVE_FAST_PATH_INSTRUCTIONS}",
+            )
+            return f"{answer}\n\n{LIVE_DISCLAIMER}"
+
         inputs = {"user_query": question, "session_id": session_id}
-        return self.crew.kickoff(inputs)
+        # Kickoff interpolates inputs into the shared task, so concurrent
+        # requests each run on their own copy of the crew.
+        return await self.crew.copy().kickoff_async(inputs=inputs)
 
-    async def stream(self, question: str):
-        raise NotImplementedError("Streaming is not supported by CrewAI.")
+    def invoke(self, question, session_id):
+        return asyncio.run(self.ainvoke(question, session_id))
 
-    def invoke(self, artifacts, session_id):
+    async def kickoff_batch(self, questions, session_id):
         """
-        Run the orchestrator agent with the given artifacts and session ID.
+        Answer several questions concurrently.
 
         Args:
-            artifacts (dict): Integrated artifacts from other agents (literature, genomic, pathway, etc.).
+            questions (list[str]): The user questions.
             session_id (str): The session identifier.
 
         Returns:
-            str: Well-formed, plausible, and verifiable research hypotheses supported by the integrated artifacts.
+            list: One crew output per question, in input order.
         """
-        inputs = {"artifacts": artifacts, "session_id": session_id}
-        return self.crew.kickoff(inputs)
+        inputs = [
+            {"user_query": question, "session_id": session_id} for question in questions
+        ]
+        return await self.crew.kickoff_for_each_async(inputs=inputs)
 
-    async def stream(self, artifacts: dict):
-        """
-        Streaming is not supported for this agent.
-        """
+    async def stream(self, question: str):
         raise NotImplementedError("Streaming is not supported by CrewAI.")
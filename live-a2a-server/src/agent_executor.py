@@ -1,5 +1,8 @@
+from functools import lru_cache
+
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
+from a2a.server.tasks import TaskUpdater
 from a2a.types import (
     InvalidParamsError,
     Part,
@@ -10,6 +13,7 @@ from a2a.types import (
 from a2a.utils import (
     completed_task,
     new_artifact,
+    new_task,
 )
 from a2a.utils.errors import ServerError
 from agent import (
@@ -17,11 +21,24 @@ from agent import (
     LiveAgent,
 )
 
+
+# Agents hold no per-request state (each call runs on a crew copy), so one
+# instance per process is shared by every executor.
+@lru_cache(maxsize=1)
+def _judge_agent_singleton() -> JudgeAgent:
+    return JudgeAgent()
+
+
+@lru_cache(maxsize=1)
+def _live_agent_singleton() -> LiveAgent:
+    return LiveAgent()
+
+
 class JudgeAgentExecutor(AgentExecutor):
     """AgentExecutor for JudgeAgent."""
 
     def __init__(self) -> None:
-        self.agent = JudgeAgent()
+        self.agent = _judge_agent_singleton()
 
     async def execute(
         self,
@@ -33,28 +50,46 @@ class JudgeAgentExecutor(AgentExecutor):
             raise ServerError(error=InvalidParamsError())
 
         intervention_data = context.get_user_input()
+        task = context.current_task
+        if not task:
+            task = new_task(context.message)
+            await event_queue.enqueue_event(task)
+        updater = TaskUpdater(event_queue, task.id, task.context_id)
+        await updater.start_work()
+
+        # Stream the answer as appends to a single artifact
+        artifact_id = f"judge_{task.id}"
+        chunks = []
         try:
-            result = self.agent.invoke(intervention_data, context.context_id)
-            print(f"Final Result ===> {result}")
+            async for chunk in self.agent.stream(intervention_data, task.context_id):
+                await updater.add_artifact(
+                    [Part(root=TextPart(text=chunk))],
+                    artifact_id=artifact_id,
+                    append=bool(chunks),
+                    last_chunk=False,
+                )
+                chunks.append(chunk)
+            print(f"Final Result ===> {''.join(chunks)}")
         except Exception as e:
             print("Error invoking agent: %s", e)
+            # The task is already working and may hold partial chunks
+            await updater.failed(
+                updater.new_agent_message(
+                    [Part(root=TextPart(text=f"Error invoking agent: {e}"))]
+                )
+            )
             raise ServerError(error=ValueError(f"Error invoking agent: {e}")) from e
 
-        parts = [
-            Part(
-                root=TextPart(
-                    text=str(result) if result else "failed to verify interventions"
-                ),
-            )
-        ]
-        await event_queue.enqueue_event(
-            completed_task(
-                context.task_id,
-                context.context_id,
-                [new_artifact(parts, f"judge_{context.task_id}")],
-                [context.message],
-            )
+        # Replace the streamed chunks with the whole answer, so the stored
+        # artifact ends as a single TextPart for non-streaming clients.
+        final_text = "".join(chunks) or "failed to verify interventions"
+        await updater.add_artifact(
+            [Part(root=TextPart(text=final_text))],
+            artifact_id=artifact_id,
+            append=False,
+            last_chunk=True,
         )
+        await updater.complete()
 
     async def cancel(
         self, request: RequestContext, event_queue: EventQueue
@@ -69,7 +104,7 @@ class LiveAgentExecutor(AgentExecutor):
     """AgentExecutor for LiveAgent."""
 
     def __init__(self) -> None:
-        self.agent = LiveAgent()
+        self.agent = _live_agent_singleton()
 
     async def execute(
         self,
@@ -82,7 +117,7 @@ class LiveAgentExecutor(AgentExecutor):
 
         question = context.get_user_input()
         try:
-            result = self.agent.invoke(question, context.context_id)
+            result = await self.agent.ainvoke(question, context.context_id)
             print(f"Final Result ===> {result}")
         except Exception as e:
             print("Error invoking agent: %s", e)
@@ -1,6 +1,7 @@
 import uvicorn
 import logging
 import os
+import sys
 import click
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
@@ -8,6 +9,7 @@ from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 from agent import JudgeAgent
 from agent_executor import JudgeAgentExecutor
+from tools import start_background_refresh
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -19,44 +21,91 @@ class MissingAPIKeyError(Exception):
     """Exception for missing API key."""
 
 
+DEFAULT_HOST = "localhost"
+DEFAULT_PORT = 10006
+
+
+def build_app():
+    """
+    Build the Judge A2A application. Used as a uvicorn factory so every
+    worker process constructs its own app, task store and data refresher.
+    """
+    capabilities = AgentCapabilities(streaming=True)
+    skill = AgentSkill(
+        id="judge_agent",
+        name="Agent-as-a-Judge",
+        description="Verify integrity and accuracy of longevity interventions, check evidence, compare studies, and mark as OK, Rejected, or for human review.",
+        tags=["judge", "verification", "longevity"],
+        examples=["Verify intervention integrity and evidence"],
+    )
+    agent_card = AgentCard(
+        name="Longevity Interventions Judge Agent",
+        description="Verify integrity and accuracy of interventions for longevity research. base your judgments on evidence and study comparisons.",
+        url=os.getenv("HOST_OVERRIDE") or f"http://{DEFAULT_HOST}:{DEFAULT_PORT}/",
+        version="1.0.0",
+        default_input_modes=JudgeAgent.SUPPORTED_CONTENT_TYPES,
+        default_output_modes=JudgeAgent.SUPPORTED_CONTENT_TYPES,
+        capabilities=capabilities,
+        skills=[skill],
+    )
+    request_handler = DefaultRequestHandler(
+        agent_executor=JudgeAgentExecutor(),
+        task_store=build_task_store(),
+    )
+    server = A2AStarletteApplication(
+        agent_card=agent_card, http_handler=request_handler
+    )
+
+    start_background_refresh()
+
+    return server.build()
+
+
+def build_task_store():
+    """
+    Tasks live in process memory unless TASK_STORE_URL names a SQLAlchemy
+    async database (e.g. postgresql+asyncpg://...), which lets several
+    workers see each other's tasks.
+    """
+    task_store_url = os.getenv("TASK_STORE_URL")
+    if not task_store_url:
+        return InMemoryTaskStore()
+    from a2a.server.tasks import DatabaseTaskStore
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    return DatabaseTaskStore(create_async_engine(task_store_url))
+
+
 @click.command()
-@click.option("--host", "host", default="localhost")
-@click.option("--port", "port", default=10006)
-def main(host, port):
+@click.option("--host", "host", default=DEFAULT_HOST)
+@click.option("--port", "port", default=DEFAULT_PORT)
+@click.option("--workers", "workers", default=int(os.getenv("WORKERS", "1")))
+def main(host, port, workers):
     try:
-        capabilities = AgentCapabilities(streaming=False)
-        skill = AgentSkill(
-            id="judge_agent",
-            name="Agent-as-a-Judge",
-            description="Verify integrity and accuracy of longevity interventions, check evidence, compare studies, and mark as OK, Rejected, or for human review.",
-            tags=["judge", "verification", "longevity"],
-            examples=["Verify intervention integrity and evidence"],
-        )
-        agent_host_url = (
-            os.getenv("HOST_OVERRIDE")
-            if os.getenv("HOST_OVERRIDE")
-            else f"http://{host}:{port}/"
-        )
-        agent_card = AgentCard(
-            name="Longevity Interventions Judge Agent",
-            description="Verify integrity and accuracy of interventions for longevity research. base your judgments on evidence and study comparisons.",
-            url=agent_host_url,
-            version="1.0.0",
-            default_input_modes=JudgeAgent.SUPPORTED_CONTENT_TYPES,
-            default_output_modes=JudgeAgent.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=[skill],
-        )
-        request_handler = DefaultRequestHandler(
-            agent_executor=JudgeAgentExecutor(),
-            task_store=InMemoryTaskStore(),
+        # Read by build_app, in this process and in every spawned worker
+        if not os.getenv("HOST_OVERRIDE"):
+            os.environ["HOST_OVERRIDE"] = f"http://{host}:{port}/"
+        if workers > 1 and not os.getenv("TASK_STORE_URL"):
+            logger.warning(
+                "Running %d workers with the in-memory task store: task lookups "
+                "only succeed on the worker that created the task. Set "
+                "TASK_STORE_URL to share tasks between workers.",
+                workers,
+            )
+        # uvloop and httptools are not available on Windows
+        server_options = (
+            {"loop": "uvloop", "http": "httptools"} if sys.platform != "win32" else {}
         )
-        server = A2AStarletteApplication(
-            agent_card=agent_card, http_handler=request_handler
-        )
-
 
-        uvicorn.run(server.build(), host=host, port=port)
+        uvicorn.run(
+            "main_judge-agent:build_app",
+            factory=True,
+            host=host,
+            port=port,
+            workers=workers,
+            log_level="info",
+            **server_options,
+        )
     except MissingAPIKeyError as e:
         logger.error(f"Error: {e}")
         exit(1)
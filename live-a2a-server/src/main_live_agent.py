@@ -8,6 +8,7 @@ from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 from agent import LiveAgent
 from agent_executor import LiveAgentExecutor
+from tools import start_background_refresh
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -56,6 +57,7 @@ def main(host, port):
             agent_card=agent_card, http_handler=request_handler
         )
 
+        start_background_refresh()
 
         uvicorn.run(server.build(), host=host, port=port)
     except MissingAPIKeyError as e:
@@ -1,16 +1,30 @@
 # Standard library imports
 import os
+import re
+import time
+import hashlib
 import logging
-import requests
-import xml.etree.ElementTree as ET
+import tempfile
+import threading
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
 
 # Third-party imports
 from dotenv import load_dotenv
+import httpx
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from cachetools import TTLCache
+from numba import njit
 from supabase import create_client, Client
 from langchain_openai import ChatOpenAI
 from langchain_experimental.agents.agent_toolkits import create_pandas_dataframe_agent
-import scholarly
+from scholarly import scholarly
 from crewai.tools import tool
 
 # Logger configuration
@@ -21,86 +35,698 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY2")
+NCBI_API_KEY = os.getenv("NCBI_API_KEY")
 
-# Initialize Supabase client and OpenAI LLM
-try:
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-    LLM = ChatOpenAI(model="gpt-4.1-mini", temperature=0.2, api_key=OPENAI_API_KEY)
+
+# Supabase client and OpenAI LLM are built lazily, once per process, so
+# importing this module never touches the network or exits on bad config.
+@lru_cache(maxsize=1)
+def get_supabase() -> Client:
+    """Return the shared Supabase client."""
+    client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    logging.info("Supabase client created successfully.")
+    return client
+
+
+@lru_cache(maxsize=1)
+def get_pandas_llm() -> ChatOpenAI:
+    """Return the shared OpenAI LLM backing the pandas agent."""
+    llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.2, api_key=OPENAI_API_KEY)
     logging.info("OpenAI client created successfully.")
-except Exception as e:
-    logging.error(f"Error initializing clients: {e}")
-    exit()
+    return llm
+
+
+# Long-lived event loop in a daemon thread that owns all async I/O, so
+# sync tool calls and awaiting callers on other loops share one client.
+_io_loop = asyncio.new_event_loop()
+threading.Thread(target=_io_loop.run_forever, name="tools-io-loop", daemon=True).start()
+
+
+def _run_on_io_loop(coro):
+    """Schedule a coroutine on the I/O loop; returns a concurrent future."""
+    return asyncio.run_coroutine_threadsafe(coro, _io_loop)
 
 
 # In-memory cache for DataFrames and last fetch time
 _df_interventions_cache = None
 _df_studies_cache = None
+_df_supabase_studies_cache = None
+# Denormalized interventions x study_extractions x studies, built per refresh
+_df_full_cache = None
 _last_fetch_time = 0
 _CACHE_INTERVAL_SECONDS = 600  # 10 minutes
 
+# PostgREST select list per table; narrow these to the columns the pandas
+# agent needs to cut transfer size and DataFrame memory.
+_TABLE_COLUMNS = {
+    "interventions": os.getenv("LIVE_INTERVENTIONS_COLUMNS", "*"),
+    "study_extractions": os.getenv("LIVE_STUDY_EXTRACTIONS_COLUMNS", "*"),
+    "studies": os.getenv("LIVE_STUDIES_COLUMNS", "*"),
+}
+_PAGE_SIZE = 1000  # PostgREST default max rows per request
+_PAGE_FETCH_WORKERS = 4
+_INTERVENTION_URL_PREFIX = "https://database.longevityadvice.com/#/intervention/"
+# Low-cardinality string columns stored as pandas categoricals
+_CATEGORICAL_COLUMNS = ("intervention_type", "model_organism", "outcome_category")
 
-@tool("query_live_database")
-def query_live_database(question: str) -> str:
+# study_extractions columns aggregated per intervention during a refresh
+_EXTRACTION_INTERVENTION_KEY = "intervention_id"
+_EXTRACTION_STUDY_KEY = "study_id"
+_FULL_INDEX_COLUMNS = ("slug", "pmid")
+_EXTRACTION_DOSE_COLUMN = "dosage"
+# Doses are converted to mg/kg before averaging; doses in any other unit
+# (ppm, mg/day, % of diet, bare numbers, ...) are left out, not mixed in.
+_DOSE_UNITS_TO_MG_PER_KG = {
+    "mg/kg": 1.0,
+    "g/kg": 1000.0,
+    "ug/kg": 0.001,
+    "µg/kg": 0.001,
+    "μg/kg": 0.001,
+    "mcg/kg": 0.001,
+}
+_EXTRACTION_P_VALUE_COLUMN = "p_value"
+_SIGNIFICANCE_THRESHOLD = 0.05
+
+# Parquet snapshots of the tables, reused across process restarts while fresh
+_SNAPSHOT_DIR = os.getenv(
+    "LIVE_DB_SNAPSHOT_DIR", os.path.join(tempfile.gettempdir(), "live_db")
+)
+
+# Serializes refreshes between request threads and the background refresher,
+# which reloads the data shortly before it expires.
+_refresh_lock = threading.Lock()
+_BACKGROUND_REFRESH_SECONDS = _CACHE_INTERVAL_SECONDS - 60
+_BACKGROUND_RETRY_SECONDS = 30
+_background_refresh_thread = None
+
+# Pandas agent over the cached DataFrames, rebuilt only after a refresh
+_PANDAS_AGENT_PREFIX = (
+    "You are working with a pandas dataframe in Python. The name of the dataframe is `df`.\n"
+    "{schema_hint}\n"
+    "You should use the tools below to answer the question posed of you:"
+)
+_pandas_agent = None
+_pandas_agent_built_at = 0.0
+_pandas_agent_lock = threading.Lock()
+
+# Answers already produced by the pandas agent, keyed by normalized question.
+# Cleared on every DataFrame refresh so answers never outlive their data.
+_response_cache = TTLCache(maxsize=512, ttl=1800)
+_response_cache_lock = threading.Lock()
+
+# Single-flight: concurrent identical questions wait on the first caller's
+# answer instead of running the pandas agent again.
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Opt-in semantic layer behind the exact-match cache (LIVE_SEMANTIC_CACHE=1):
+# a paraphrased question whose embedding has cosine similarity >= threshold
+# with an answered one reuses that answer, provided both name the same
+# interventions, organisms and numbers, which embeddings barely tell apart.
+# Only the retrieval-style LIVE lookups go through it; the Judge's
+# evaluations are never cached. Needs the optional sentence-transformers and
+# faiss-cpu packages.
+_SEMANTIC_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+_SEMANTIC_CACHE_THRESHOLD = float(os.getenv("LIVE_SEMANTIC_CACHE_THRESHOLD", "0.92"))
+_SEMANTIC_CACHE_MAX_ENTRIES = 10_000
+_SEMANTIC_CACHE_CANDIDATES = 5
+_ORGANISM_TERMS = {
+    "human": "human",
+    "humans": "human",
+    "people": "human",
+    "patients": "human",
+    "mouse": "mouse",
+    "mice": "mouse",
+    "murine": "mouse",
+    "rat": "rat",
+    "rats": "rat",
+    "worm": "worm",
+    "worms": "worm",
+    "nematode": "worm",
+    "nematodes": "worm",
+    "elegans": "worm",
+    "fly": "fly",
+    "flies": "fly",
+    "drosophila": "fly",
+    "yeast": "yeast",
+    "dog": "dog",
+    "dogs": "dog",
+    "monkey": "primate",
+    "monkeys": "primate",
+    "primate": "primate",
+    "primates": "primate",
+    "macaque": "primate",
+    "macaques": "primate",
+}
+_intervention_terms: frozenset = frozenset()
+_semantic_index = None
+_semantic_answers: list[tuple[str, float, frozenset]] = []
+_semantic_cache_lock = threading.Lock()
+
+
+def _normalize_question(question: str) -> str:
+    """Lowercase the question and collapse runs of whitespace."""
+    return re.sub(r"\s+", " ", question).strip().lower()
+
+
+def _response_cache_key(question: str) -> str:
+    return hashlib.blake2b(_normalize_question(question).encode()).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _get_embedder():
+    """Return the sentence embedding model, or None if the cache is off."""
+    if os.getenv("LIVE_SEMANTIC_CACHE", "0") != "1":
+        return None
+    try:
+        from sentence_transformers import SentenceTransformer
+        import faiss  # noqa: F401
+    except ImportError:
+        logging.warning(
+            "LIVE_SEMANTIC_CACHE=1 but sentence-transformers/faiss are not installed; "
+            "semantic cache disabled."
+        )
+        return None
+    return SentenceTransformer(_SEMANTIC_CACHE_MODEL)
+
+
+def _question_specifics(question: str) -> frozenset:
+    """Interventions, organisms and numbers a question names."""
+    words = re.findall(r"[a-z]+|\d+(?:\.\d+)?", _normalize_question(question))
+    return frozenset(
+        _ORGANISM_TERMS.get(word, word)
+        for word in words
+        if word in _ORGANISM_TERMS or word in _intervention_terms or word[0].isdigit()
+    )
+
+
+def _embed_question(question: str) -> np.ndarray | None:
+    """Unit-norm embedding of the normalized question, shaped (1, dim)."""
+    embedder = _get_embedder()
+    if embedder is None:
+        return None
+    return embedder.encode(
+        [_normalize_question(question)], normalize_embeddings=True
+    ).astype(np.float32)
+
+
+def _get_semantic_answer(embedding: np.ndarray | None, question: str) -> str | None:
+    if embedding is None:
+        return None
+    specifics = _question_specifics(question)
+    with _semantic_cache_lock:
+        if _semantic_index is None or _semantic_index.ntotal == 0:
+            return None
+        scores, ids = _semantic_index.search(embedding, _SEMANTIC_CACHE_CANDIDATES)
+        for score, entry in zip(scores[0], ids[0]):
+            if entry < 0 or score < _SEMANTIC_CACHE_THRESHOLD:
+                break
+            answer, stored_at, stored_specifics = _semantic_answers[entry]
+            if (
+                stored_specifics == specifics
+                and time.time() - stored_at <= _response_cache.ttl
+            ):
+                return answer
+    return None
+
+
+def _store_semantic_answer(
+    embedding: np.ndarray | None, question: str, answer: str, fetched_at: float
+) -> None:
+    global _semantic_index, _semantic_answers
+    if embedding is None:
+        return
+    import faiss
+
+    specifics = _question_specifics(question)
+    with _semantic_cache_lock:
+        # Skip answers computed from data that a refresh has since replaced
+        if fetched_at != _last_fetch_time:
+            return
+        if _semantic_index is None:
+            _semantic_index = faiss.IndexFlatIP(embedding.shape[1])
+        elif _semantic_index.ntotal >= _SEMANTIC_CACHE_MAX_ENTRIES:
+            # Keep the newer half; a flat index is cheap to rebuild
+            keep = _SEMANTIC_CACHE_MAX_ENTRIES // 2
+            vectors = _semantic_index.reconstruct_n(_semantic_index.ntotal - keep, keep)
+            _semantic_index = faiss.IndexFlatIP(embedding.shape[1])
+            _semantic_index.add(vectors)
+            _semantic_answers = _semantic_answers[-keep:]
+        _semantic_index.add(embedding)
+        _semantic_answers.append((answer, time.time(), specifics))
+
+
+def bust_cache() -> None:
+    """Drop every cached query_live_database answer."""
+    global _semantic_index, _semantic_answers
+    with _response_cache_lock:
+        _response_cache.clear()
+    with _semantic_cache_lock:
+        _semantic_index = None
+        _semantic_answers = []
+    logging.info("query_live_database response cache cleared.")
+
+
+def _fetch_table(table: str) -> pd.DataFrame:
     """
-    Tool to answer questions about longevity intervention data.
-    Uses cached DataFrames unless cache is expired (default: 10 minutes).
-    Args:
-        question (str): The user's query about longevity intervention data.
-    Returns:
-        str: The tool's answer or an error message.
+    Download a whole table from Supabase, one page per request.
+    The first page also returns the row count; the remaining pages are
+    fetched in parallel.
     """
-    import time
+    columns = _TABLE_COLUMNS[table]
 
-    global _df_interventions_cache, _df_studies_cache, _df_supabase_studies_cache, _last_fetch_time
+    def fetch_page(offset, count=None):
+        response = (
+            get_supabase()
+            .table(table)
+            .select(columns, count=count)
+            .order("id")
+            .range(offset, offset + _PAGE_SIZE - 1)
+            .execute()
+        )
+        if hasattr(response, "error") and response.error is not None:
+            raise RuntimeError(f"Error fetching '{table}': {response.error}")
+        return response
 
-    logging.info("Invoking query_live_database tool.")
+    first_page = fetch_page(0, count="exact")
+    records = list(first_page.data)
+    total = first_page.count or len(records)
+    with ThreadPoolExecutor(max_workers=_PAGE_FETCH_WORKERS) as executor:
+        for page in executor.map(fetch_page, range(_PAGE_SIZE, total, _PAGE_SIZE)):
+            records.extend(page.data)
+
+    selected = None if columns == "*" else [c.strip() for c in columns.split(",")]
+    return _build_dataframe(table, records, selected)
+
+
+def _build_dataframe(table: str, records: list, columns: list | None) -> pd.DataFrame:
+    """
+    Convert Supabase rows to an Arrow-backed DataFrame, deriving
+    url_intervention on the Arrow side. Falls back to pandas inference when
+    a column mixes types Arrow cannot unify.
+    """
+    try:
+        arrow_table = pa.Table.from_pylist(records)
+        if columns is not None and records:
+            arrow_table = arrow_table.select(columns)
+        if table == "interventions" and "slug" in arrow_table.column_names:
+            urls = pc.binary_join_element_wise(
+                _INTERVENTION_URL_PREFIX,
+                pc.cast(arrow_table["slug"], pa.string()),
+                "",
+            )
+            # Dictionary-encoded: the column is repeated once per study in
+            # the pre-joined frame, which then only stores int32 codes.
+            arrow_table = arrow_table.append_column(
+                "url_intervention",
+                pc.dictionary_encode(urls).cast(pa.dictionary(pa.int32(), pa.string())),
+            )
+        df = arrow_table.to_pandas(types_mapper=_pandas_dtype)
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        logging.warning(f"Falling back to pandas dtypes for '{table}': {e}")
+        df = pd.DataFrame.from_records(records, columns=columns)
+        if table == "interventions" and "slug" in df.columns:
+            df["url_intervention"] = (
+                _INTERVENTION_URL_PREFIX + df["slug"].astype(str)
+            ).astype("category")
+    return _categorize(df)
+
+
+def _pandas_dtype(arrow_type: pa.DataType):
+    """ArrowDtype for every column except dictionaries, kept as Categorical."""
+    if pa.types.is_dictionary(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
+
+
+def _categorize(df: pd.DataFrame) -> pd.DataFrame:
+    for column in _CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
+
+
+@njit(cache=True)
+def _dose_log_mean(codes, doses, n_groups):
+    """Mean log dose per group (log of the geometric mean); NaN if no dose."""
+    sums = np.zeros(n_groups)
+    counts = np.zeros(n_groups, dtype=np.int64)
+    for i in range(codes.size):
+        if codes[i] >= 0 and doses[i] > 0:
+            sums[codes[i]] += np.log(doses[i])
+            counts[codes[i]] += 1
+    out = np.full(n_groups, np.nan)
+    for group in range(n_groups):
+        if counts[group] > 0:
+            out[group] = sums[group] / counts[group]
+    return out
+
+
+@njit(cache=True)
+def _count_significant(codes, p_values, threshold, n_groups):
+    """Number of p-values below the threshold per group."""
+    counts = np.zeros(n_groups, dtype=np.int32)
+    for i in range(codes.size):
+        if codes[i] >= 0 and p_values[i] < threshold:
+            counts[codes[i]] += 1
+    return counts
 
-    # Check cache validity
-    cache_expired = (
+
+def _dose_mg_per_kg(dosage: pd.Series) -> np.ndarray:
+    """Dose strings such as "8 mg/kg/day" in mg/kg; NaN for any other unit."""
+    parts = dosage.astype("string").str.extract(r"^\s*(\d*\.?\d+)\s*(.*?)\s*$")
+    units = (
+        parts[1]
+        .str.lower()
+        .str.replace(r"\s+", "", regex=True)
+        .str.replace(r"(/day|/d|perday|daily)$", "", regex=True)
+    )
+    factor = units.map(_DOSE_UNITS_TO_MG_PER_KG).astype("float64")
+    values = pd.to_numeric(parts[0], errors="coerce").astype("float64") * factor
+    return values.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _add_derived_columns(frames: dict) -> None:
+    """
+    Precompute per-intervention aggregates over study_extractions so the
+    pandas agent can read them instead of writing the aggregation itself:
+    dose_log_mean_mg_per_kg (float32), over doses reported in mg/kg only, and
+    evidence_score, the number of significant results (int32). Skipped when
+    the source columns are absent or unusable.
+    """
+    interventions = frames["interventions"]
+    extractions = frames["study_extractions"]
+    if (
+        "id" not in interventions.columns
+        or _EXTRACTION_INTERVENTION_KEY not in extractions.columns
+    ):
+        return
+
+    try:
+        codes, groups = pd.factorize(extractions[_EXTRACTION_INTERVENTION_KEY])
+        codes = codes.astype(np.int64)
+
+        def numeric(column):
+            values = pd.to_numeric(extractions[column], errors="coerce")
+            return values.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        if _EXTRACTION_DOSE_COLUMN in extractions.columns:
+            dose = _dose_log_mean(
+                codes,
+                _dose_mg_per_kg(extractions[_EXTRACTION_DOSE_COLUMN]),
+                len(groups),
+            )
+            interventions["dose_log_mean_mg_per_kg"] = (
+                interventions["id"]
+                .map(pd.Series(dose, index=groups))
+                .astype(np.float32)
+            )
+        if _EXTRACTION_P_VALUE_COLUMN in extractions.columns:
+            significant = _count_significant(
+                codes,
+                numeric(_EXTRACTION_P_VALUE_COLUMN),
+                _SIGNIFICANCE_THRESHOLD,
+                len(groups),
+            )
+            interventions["evidence_score"] = (
+                interventions["id"]
+                .map(pd.Series(significant, index=groups))
+                .fillna(0)
+                .astype(np.int32)
+            )
+    except (ValueError, TypeError, KeyError) as e:
+        # Derived columns are an optimization; the refresh goes on without them
+        logging.warning(f"Could not derive per-intervention aggregates: {e}")
+
+
+def _build_full_frame(frames: dict) -> pd.DataFrame | None:
+    """
+    Join the three tables once so the pandas agent can look rows up with
+    .loc instead of planning the joins on every question. Returns None when
+    the join keys are missing or cannot be joined.
+    """
+    interventions = frames["interventions"]
+    extractions = frames["study_extractions"]
+    studies = frames["studies"]
+    if (
+        "id" not in interventions.columns
+        or "id" not in studies.columns
+        or _EXTRACTION_INTERVENTION_KEY not in extractions.columns
+        or _EXTRACTION_STUDY_KEY not in extractions.columns
+    ):
+        return None
+
+    try:
+        df_full = interventions.merge(
+            extractions,
+            left_on="id",
+            right_on=_EXTRACTION_INTERVENTION_KEY,
+            how="left",
+            suffixes=("", "_extraction"),
+        ).merge(
+            studies,
+            left_on=_EXTRACTION_STUDY_KEY,
+            right_on="id",
+            how="left",
+            suffixes=("", "_study"),
+        )
+        index_columns = [c for c in _FULL_INDEX_COLUMNS if c in df_full.columns]
+        if index_columns:
+            df_full = df_full.set_index(index_columns).sort_index()
+    except (ValueError, TypeError, KeyError) as e:
+        # e.g. join keys whose dtypes differ between tables
+        logging.warning(f"Could not build the joined DataFrame: {e}")
+        return None
+    df_full.attrs["schema_hint"] = (
+        "`df` joins the interventions, study_extractions and studies tables: one "
+        "row per intervention and extracted study result, interventions without "
+        f"studies included. Index: {', '.join(index_columns) or 'none'}. "
+        "Columns from study_extractions and studies that clash with interventions "
+        "carry the suffixes _extraction and _study. Prefer df.loc lookups and "
+        "filters over re-deriving joins. Columns: "
+        + ", ".join(map(str, df_full.columns))
+        + "."
+    )
+    if "dose_log_mean_mg_per_kg" in df_full.columns:
+        df_full.attrs["schema_hint"] += (
+            " dose_log_mean_mg_per_kg is the natural log of the geometric mean dose "
+            "over the intervention's studies that report mg/kg; doses in other "
+            "units are not included, so check the dosage column before quoting it."
+        )
+    return df_full
+
+
+async def _fetch_tables() -> dict:
+    """Fetch every table concurrently; one blocking client call per thread."""
+    frames = await asyncio.gather(
+        *(asyncio.to_thread(_fetch_table, table) for table in _TABLE_COLUMNS)
+    )
+    return dict(zip(_TABLE_COLUMNS, frames))
+
+
+def _snapshot_path(table: str) -> str:
+    return os.path.join(_SNAPSHOT_DIR, f"{table}.parquet")
+
+
+def _save_snapshot(frames: dict, fetched_at: float) -> None:
+    """
+    Persist the DataFrames as zstd Parquet with dictionary-encoded strings.
+    File mtimes are set to the fetch time so the snapshot's age matches the
+    data's. Failures only cost the warm start.
+    """
+    try:
+        os.makedirs(_SNAPSHOT_DIR, exist_ok=True)
+        for table, df in frames.items():
+            # Unique per writer: servers and workers sharing the directory may
+            # write the same table concurrently; os.replace keeps it atomic.
+            with tempfile.NamedTemporaryFile(
+                dir=_SNAPSHOT_DIR, prefix=f"{table}.", suffix=".tmp", delete=False
+            ) as tmp:
+                tmp_path = tmp.name
+            try:
+                pq.write_table(
+                    pa.Table.from_pandas(df, preserve_index=False),
+                    tmp_path,
+                    compression="zstd",
+                    use_dictionary=True,
+                )
+                os.utime(tmp_path, (fetched_at, fetched_at))
+                os.replace(tmp_path, _snapshot_path(table))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+    except Exception as e:
+        logging.warning(f"Could not write Parquet snapshot: {e}")
+
+
+def _load_snapshot():
+    """
+    Load the Parquet snapshot if it is younger than the cache interval and
+    newer than the data already in memory, e.g. written by another process.
+    Returns (frames, saved_at) or None.
+    """
+    try:
+        saved_at = min(os.path.getmtime(_snapshot_path(t)) for t in _TABLE_COLUMNS)
+        if (
+            saved_at <= _last_fetch_time
+            or (time.time() - saved_at) > _CACHE_INTERVAL_SECONDS
+        ):
+            return None
+        frames = {
+            t: _categorize(
+                pq.read_table(_snapshot_path(t), memory_map=True).to_pandas(
+                    types_mapper=_pandas_dtype
+                )
+            )
+            for t in _TABLE_COLUMNS
+        }
+        return frames, saved_at
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.warning(f"Could not read Parquet snapshot: {e}")
+        return None
+
+
+def _refresh_dataframes() -> None:
+    """Reload the cached DataFrames from a fresh snapshot or from Supabase."""
+    global _df_interventions_cache, _df_studies_cache, _df_supabase_studies_cache, _df_full_cache, _last_fetch_time, _intervention_terms
+
+    snapshot = _load_snapshot()
+    if snapshot is not None:
+        frames, fetched_at = snapshot
+        logging.info("Loaded DataFrames from Parquet snapshot.")
+    else:
+        logging.info("Fetching data from Supabase...")
+        frames = _run_on_io_loop(_fetch_tables()).result()
+        _add_derived_columns(frames)
+        fetched_at = time.time()
+        _save_snapshot(frames, fetched_at)
+
+    _df_interventions_cache = frames["interventions"]
+    _df_studies_cache = frames["study_extractions"]
+    _df_supabase_studies_cache = frames["studies"]
+    _df_full_cache = _build_full_frame(frames)
+    _intervention_terms = _slug_terms(_df_interventions_cache)
+    _last_fetch_time = fetched_at
+    bust_cache()
+
+
+def _slug_terms(interventions: pd.DataFrame) -> frozenset:
+    """Words of the intervention slugs, e.g. nicotinamide and riboside."""
+    if "slug" not in interventions.columns:
+        return frozenset()
+    slugs = interventions["slug"].dropna().astype(str).str.lower()
+    return frozenset(
+        word for slug in slugs for word in re.split(r"[^a-z]+", slug) if len(word) > 2
+    )
+
+
+def _dataframes_expired() -> bool:
+    return (
         _df_interventions_cache is None
         or _df_studies_cache is None
-        or "_df_supabase_studies_cache" not in globals()
         or _df_supabase_studies_cache is None
-        or _last_fetch_time is None
         or (time.time() - _last_fetch_time) > _CACHE_INTERVAL_SECONDS
     )
 
-    if cache_expired:
-        logging.info("Cache expired or empty. Fetching data from Supabase...")
+
+def _background_refresh_loop() -> None:
+    while True:
         try:
-            interventions_response = (
-                supabase.table("interventions").select("*").execute()
-            )
-            studies_response = supabase.table("study_extractions").select("*").execute()
-            supabase_studies_response = supabase.table("studies").select("*").execute()
+            with _refresh_lock:
+                _refresh_dataframes()
+        except Exception as e:
+            logging.error(f"Background refresh of LIVE data failed: {e}")
+        next_refresh = _last_fetch_time + _BACKGROUND_REFRESH_SECONDS
+        time.sleep(max(next_refresh - time.time(), _BACKGROUND_RETRY_SECONDS))
 
-            if (
-                hasattr(interventions_response, "error")
-                and interventions_response.error is not None
-            ):
-                return f"Error fetching 'interventions': {interventions_response.error}"
-            if (
-                hasattr(studies_response, "error")
-                and studies_response.error is not None
-            ):
-                return f"Error fetching 'study_extractions': {studies_response.error}"
-            if (
-                hasattr(supabase_studies_response, "error")
-                and supabase_studies_response.error is not None
-            ):
-                return f"Error fetching 'studies': {supabase_studies_response.error}"
-
-            # Convert data to Pandas DataFrames
-            _df_interventions_cache = pd.DataFrame(interventions_response.data)
-            # Add url_intervention column based on slug
-            if "slug" in _df_interventions_cache.columns:
-                _df_interventions_cache["url_intervention"] = (
-                    "https://database.longevityadvice.com/#/intervention/"
-                    + _df_interventions_cache["slug"].astype(str)
+
+def start_background_refresh() -> None:
+    """
+    Load the LIVE data now and keep it refreshed from a daemon thread, so
+    requests never wait on the Supabase fetch.
+    """
+    global _background_refresh_thread
+
+    if _background_refresh_thread is None:
+        _background_refresh_thread = threading.Thread(
+            target=_background_refresh_loop, name="live-db-refresh", daemon=True
+        )
+        _background_refresh_thread.start()
+
+
+def _get_pandas_agent():
+    """
+    Return a pandas agent for one question. The executor (LLM and prompt) is
+    shared and rebuilt only when the DataFrames change, but each call gets
+    its own REPL namespace over shallow copies of the frames, so code run
+    for one question cannot leave variables or reassigned frames behind for
+    the next one or for a concurrent call.
+    """
+    global _pandas_agent, _pandas_agent_built_at
+
+    with _pandas_agent_lock:
+        if _pandas_agent is None or _pandas_agent_built_at < _last_fetch_time:
+            logging.info("Creating in-memory Pandas agent...")
+            if _df_full_cache is not None:
+                # Single pre-joined dataframe, described in the prompt
+                _pandas_agent = create_pandas_dataframe_agent(
+                    get_pandas_llm(),
+                    df=_df_full_cache,
+                    prefix=_PANDAS_AGENT_PREFIX.format(
+                        schema_hint=_df_full_cache.attrs["schema_hint"]
+                    ),
+                    verbose=True,
+                    allow_dangerous_code=True,
+                )
+            else:
+                # Pass all dataframes to the agent
+                _pandas_agent = create_pandas_dataframe_agent(
+                    get_pandas_llm(),
+                    df=[
+                        _df_interventions_cache,
+                        _df_studies_cache,
+                        _df_supabase_studies_cache,
+                    ],
+                    verbose=True,
+                    allow_dangerous_code=True,
                 )
-            _df_studies_cache = pd.DataFrame(studies_response.data)
-            _df_supabase_studies_cache = pd.DataFrame(supabase_studies_response.data)
-            _last_fetch_time = time.time()
+            _pandas_agent_built_at = _last_fetch_time
+            logging.info("Agent created.")
+        agent = _pandas_agent
+
+    repl = agent.tools[0]
+    fresh_repl = repl.model_copy(
+        update={
+            "globals": {},
+            "locals": {
+                name: frame.copy(deep=False) for name, frame in repl.locals.items()
+            },
+        }
+    )
+    return agent.model_copy(update={"tools": [fresh_repl]})
+
+
+@tool("query_live_database")
+def query_live_database(question: str) -> str:
+    """
+    Tool to answer questions about longevity intervention data.
+    Uses cached DataFrames unless cache is expired (default: 10 minutes).
+    Args:
+        question (str): The user's query about longevity intervention data.
+    Returns:
+        str: The tool's answer or an error message.
+    """
+    logging.info("Invoking query_live_database tool.")
+
+    if _dataframes_expired():
+        logging.info("Cache expired or empty. Refreshing DataFrames...")
+        try:
+            with _refresh_lock:
+                # Another thread may have refreshed while we waited
+                if _dataframes_expired():
+                    _refresh_dataframes()
 
             if (
                 _df_interventions_cache.empty
@@ -118,16 +744,57 @@ def query_live_database(question: str) -> str:
     else:
         logging.info("Using cached DataFrames.")
 
-    logging.info("Step 2: Creating in-memory Pandas agent...")
+    cache_key = _response_cache_key(question)
+    cached_answer = _get_cached_answer(cache_key)
+    if cached_answer is not None:
+        logging.info("Returning cached answer for query_live_database.")
+        return cached_answer
+
+    embedding = _embed_question(question)
+    semantic_answer = _get_semantic_answer(embedding, question)
+    if semantic_answer is not None:
+        logging.info("Returning semantically cached answer for query_live_database.")
+        with _response_cache_lock:
+            _response_cache[cache_key] = semantic_answer
+        return semantic_answer
+
+    with _inflight_lock:
+        inflight = _inflight.get(cache_key)
+        is_leader = inflight is None
+        if is_leader:
+            inflight = _inflight[cache_key] = Future()
+    if not is_leader:
+        logging.info("Waiting for an identical in-flight query_live_database call.")
+        return inflight.result()
+
     try:
-        # Pass all dataframes to the agent
-        agent = create_pandas_dataframe_agent(
-            LLM,
-            df=[_df_interventions_cache, _df_studies_cache, _df_supabase_studies_cache],
-            verbose=True,
-            allow_dangerous_code=True,
-        )
-        logging.info("Agent created.")
+        # The answer may have landed while no call was in flight
+        answer = _get_cached_answer(cache_key)
+        if answer is None:
+            answer = _ask_pandas_agent(question, cache_key, embedding)
+        inflight.set_result(answer)
+        return answer
+    except BaseException as e:
+        inflight.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(cache_key, None)
+
+
+def _get_cached_answer(cache_key: str) -> str | None:
+    with _response_cache_lock:
+        return _response_cache.get(cache_key)
+
+
+def _ask_pandas_agent(
+    question: str, cache_key: str, embedding: np.ndarray | None = None
+) -> str:
+    """Run the question through the pandas agent and cache a successful answer."""
+    fetched_at = _last_fetch_time
+    logging.info("Step 2: Getting in-memory Pandas agent...")
+    try:
+        agent = _get_pandas_agent()
     except Exception as e:
         logging.info(f"Exception while creating agent: {e}")
         return f"Exception while creating agent: {e}"
@@ -136,9 +803,14 @@ def query_live_database(question: str) -> str:
     try:
         response = agent.invoke(
             question
-            + ", Please provide detailed answers with citations or URLs, and related studies where possible."
+            + "\n\nPlease cite the studies with their URLs and mention related studies where possible."
         )
         logging.info(f"Agent response: {response}")
+        with _response_cache_lock:
+            # Skip answers computed from data that a refresh has since replaced
+            if fetched_at == _last_fetch_time:
+                _response_cache[cache_key] = response["output"]
+        _store_semantic_answer(embedding, question, response["output"], fetched_at)
         return response["output"]
     except Exception as e:
         logging.info(f"Error during agent execution: {e}")
@@ -173,8 +845,12 @@ def get_user_personal_data(filters: dict):
         - wbc_count: White Blood Cell Count (10^3 cells/µL)
     """
     table = "user_personal_data"
-    query = supabase.table(table).select(
-        "id, email, name, gender, age, chronological_age, diabetes, albumin, creatinine, glucose, crp, lymphocyte_percent, mcv, rdw, alkaline_phosphatase, wbc_count"
+    query = (
+        get_supabase()
+        .table(table)
+        .select(
+            "id, email, name, gender, age, chronological_age, diabetes, albumin, creatinine, glucose, crp, lymphocyte_percent, mcv, rdw, alkaline_phosphatase, wbc_count"
+        )
     )
     for key, value in filters.items():
         query = query.eq(key, value)
@@ -182,40 +858,102 @@ def get_user_personal_data(filters: dict):
     return response.data
 
 
-@tool("pubmed_tool")
-def pubmed_tool(query: str, max_results: int = 5) -> str:
+# Shared NCBI client: esearch and esummary reuse pooled keep-alive connections
+_PUBMED_ESEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
+_PUBMED_ESUMMARY_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
+_PUBMED_EFETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+_PUBMED_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+_PUBMED_RETRIES = 3
+_PUBMED_BACKOFF_SECONDS = 0.2
+_PUBMED_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_pubmed_client = None
+
+
+def _get_pubmed_client() -> httpx.AsyncClient:
+    """Create the NCBI client on first use; must run on the I/O loop."""
+    global _pubmed_client
+
+    if _pubmed_client is None:
+        _pubmed_client = httpx.AsyncClient(
+            timeout=_PUBMED_TIMEOUT,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=4),
+            # An API key raises the NCBI rate limit from 3 to 10 requests per second
+            params={"api_key": NCBI_API_KEY} if NCBI_API_KEY else None,
+            transport=httpx.AsyncHTTPTransport(retries=_PUBMED_RETRIES),
+        )
+    return _pubmed_client
+
+
+async def _ncbi_get(url: str, params: dict) -> httpx.Response:
+    """GET an E-utilities endpoint, retrying rate-limit and server errors."""
+    client = _get_pubmed_client()
+    for attempt in range(_PUBMED_RETRIES + 1):
+        response = await client.get(url, params=params)
+        if (
+            response.status_code not in _PUBMED_RETRY_STATUSES
+            or attempt == _PUBMED_RETRIES
+        ):
+            break
+        await asyncio.sleep(_PUBMED_BACKOFF_SECONDS * 2**attempt)
+    response.raise_for_status()
+    return response
+
+
+def _parse_efetch(xml_bytes: bytes) -> dict:
     """
-    Search PubMed for scientific articles using the NCBI E-utilities API.
-    Args:
-        query (str): The search term or query string.
-        max_results (int): Maximum number of articles to return (default: 5).
-    Returns:
-        str: A summary of PubMed search results, or an error message.
+    Map each PMID in a PubMed efetch XML payload to its abstract text.
+    Articles are parsed one at a time and discarded, keeping memory flat
+    on large fetches.
+    """
+    from lxml import etree
 
-    Each result includes:
-        - PMID
-        - Title
-        - Authors
-        - Journal
-        - Year
+    abstracts = {}
+    for _, article in etree.iterparse(
+        BytesIO(xml_bytes), events=("end",), tag="PubmedArticle"
+    ):
+        pmid = article.findtext("MedlineCitation/PMID")
+        if pmid:
+            abstracts[pmid] = " ".join(
+                "".join(part.itertext()).strip()
+                for part in article.iterfind(".//Abstract/AbstractText")
+            )
+        article.clear()
+        while article.getprevious() is not None:
+            del article.getparent()[0]
+    return abstracts
+
+
+async def _fetch_abstracts(ids: list) -> dict | None:
+    """
+    Abstracts for the PMIDs, or None if efetch fails; the summaries already
+    fetched are still worth returning without them.
     """
+    fetch_params = {"db": "pubmed", "id": ",".join(ids), "retmode": "xml"}
+    try:
+        fetch_resp = await _ncbi_get(_PUBMED_EFETCH_URL, fetch_params)
+        return await asyncio.to_thread(_parse_efetch, fetch_resp.content)
+    except Exception as e:
+        logging.error(f"Error fetching PubMed abstracts: {e}")
+        return None
+
+
+async def _pubmed_search(
+    query: str, max_results: int, include_abstracts: bool = False
+) -> str:
     logging.info(
-        f"Invoking pubmed_tool with query='{query}', max_results={max_results}"
+        f"Invoking pubmed_tool with query='{query}', max_results={max_results}, include_abstracts={include_abstracts}"
     )
-    esearch_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
     params = {"db": "pubmed", "term": query, "retmax": max_results, "retmode": "json"}
     try:
-        esearch_resp = requests.get(esearch_url, params=params)
-        esearch_resp.raise_for_status()
+        esearch_resp = await _ncbi_get(_PUBMED_ESEARCH_URL, params)
         ids = esearch_resp.json()["esearchresult"].get("idlist", [])
         if not ids:
             logging.info(f"pubmed_tool: No articles found for query: {query}")
             return f"No articles found for query: {query}"
-        esummary_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
         summary_params = {"db": "pubmed", "id": ",".join(ids), "retmode": "json"}
-        summary_resp = requests.get(esummary_url, params=summary_params)
-        summary_resp.raise_for_status()
+        summary_resp = await _ncbi_get(_PUBMED_ESUMMARY_URL, summary_params)
         summaries = summary_resp.json()["result"]
+        abstracts = await _fetch_abstracts(ids) if include_abstracts else None
         output = []
         for pmid in ids:
             item = summaries.get(pmid, {})
@@ -223,9 +961,10 @@ def pubmed_tool(query: str, max_results: int = 5) -> str:
             authors = ", ".join([a["name"] for a in item.get("authors", [])])
             journal = item.get("fulljournalname", "")
             year = item.get("pubdate", "")
-            output.append(
-                f"PMID: {pmid}\nTitle: {title}\nAuthors: {authors}\nJournal: {journal}\nYear: {year}\n---"
-            )
+            entry = f"PMID: {pmid}\nTitle: {title}\nAuthors: {authors}\nJournal: {journal}\nYear: {year}\n"
+            if abstracts is not None:
+                entry += f"Abstract: {abstracts.get(pmid) or 'No abstract'}\n"
+            output.append(entry + "---")
         logging.info("pubmed_tool executed successfully")
         return "\n".join(output)
     except Exception as e:
@@ -233,44 +972,160 @@ def pubmed_tool(query: str, max_results: int = 5) -> str:
         return f"Error querying PubMed: {e}"
 
 
-@tool("google_scholar_tool")
-def google_scholar_tool(query: str, max_results: int = 5) -> str:
+async def pubmed_search_async(
+    query: str, max_results: int = 5, include_abstracts: bool = False
+) -> str:
+    """Awaitable pubmed_tool, usable from any event loop."""
+    return await asyncio.wrap_future(
+        _run_on_io_loop(_pubmed_search(query, max_results, include_abstracts))
+    )
+
+
+@tool("pubmed_tool")
+def pubmed_tool(
+    query: str, max_results: int = 5, include_abstracts: bool = False
+) -> str:
     """
-    Search Google Scholar for scientific articles using the scholarly library.
-    Note: Google Scholar does not provide an official public API. This tool uses the 'scholarly' Python package.
+    Search PubMed for scientific articles using the NCBI E-utilities API.
     Args:
         query (str): The search term or query string.
         max_results (int): Maximum number of articles to return (default: 5).
+        include_abstracts (bool): Also fetch each article's abstract (default: False).
     Returns:
-        str: A summary of Google Scholar search results, or an error message.
+        str: A summary of PubMed search results, or an error message.
 
     Each result includes:
+        - PMID
         - Title
         - Authors
+        - Journal
         - Year
-        - Venue
+        - Abstract (only if include_abstracts is True)
     """
+    return _run_on_io_loop(
+        _pubmed_search(query, max_results, include_abstracts)
+    ).result()
+
+
+# Google Scholar is scraped, slow and prone to CAPTCHA blocks: results are
+# cached for a day, each fetch is bounded by a timeout, and repeated failures
+# open a circuit breaker. All of this state lives on the I/O loop.
+_SCHOLAR_TIMEOUT_SECONDS = 8
+_SCHOLAR_FAILURE_THRESHOLD = 3
+_SCHOLAR_FAILURE_WINDOW_SECONDS = 300  # 5 minutes
+_SCHOLAR_COOLDOWN_SECONDS = 600  # 10 minutes
+_scholar_cache = TTLCache(maxsize=256, ttl=86400)
+_scholar_failure_streak = 0
+_scholar_streak_started_at = 0.0
+_scholar_open_until = 0.0
+# A timed-out scholarly call cannot be cancelled and keeps its thread, so it
+# runs on its own pool instead of the loop's default executor, which the
+# Supabase refresh and efetch parsing share.
+_scholar_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="scholar")
+
+
+def _fetch_google_scholar(query: str, max_results: int) -> str:
+    results = scholarly.search_pubs(query)
+    output = []
+    for i, pub in enumerate(results):
+        if i >= max_results:
+            break
+        bib = pub.get("bib", {})
+        title = bib.get("title", "No title")
+        author = bib.get("author", "")
+        year = bib.get("pub_year", "")
+        venue = bib.get("venue", "")
+        output.append(
+            f"Title: {title}\nAuthors: {author}\nYear: {year}\nVenue: {venue}\n---"
+        )
+    if not output:
+        logging.info(f"google_scholar_tool: No articles found for query: {query}")
+        return f"No articles found for query: {query}"
+    logging.info("google_scholar_tool executed successfully")
+    return "\n".join(output)
+
+
+def _record_scholar_failure() -> None:
+    global _scholar_failure_streak, _scholar_streak_started_at, _scholar_open_until
+
+    now = time.time()
+    if (
+        _scholar_failure_streak == 0
+        or (now - _scholar_streak_started_at) > _SCHOLAR_FAILURE_WINDOW_SECONDS
+    ):
+        _scholar_failure_streak = 1
+        _scholar_streak_started_at = now
+    else:
+        _scholar_failure_streak += 1
+    if _scholar_failure_streak >= _SCHOLAR_FAILURE_THRESHOLD:
+        logging.warning(
+            f"google_scholar_tool failed {_scholar_failure_streak} times in a row; "
+            f"skipping Google Scholar for {_SCHOLAR_COOLDOWN_SECONDS} seconds."
+        )
+        _scholar_open_until = now + _SCHOLAR_COOLDOWN_SECONDS
+        _scholar_failure_streak = 0
+
+
+async def _google_scholar_search(query: str, max_results: int) -> str:
+    global _scholar_failure_streak
+
     logging.info(
         f"Invoking google_scholar_tool with query='{query}', max_results={max_results}"
     )
+    cache_key = (_normalize_question(query), max_results)
+    cached = _scholar_cache.get(cache_key)
+    if cached is not None:
+        logging.info("Returning cached Google Scholar results.")
+        return cached
+    if time.time() < _scholar_open_until:
+        return "Scholar temporarily unavailable"
+
     try:
-        results = scholarly.search_pubs(query)
-        output = []
-        for i, pub in enumerate(results):
-            if i >= max_results:
-                break
-            title = getattr(pub, "bib", {}).get("title", "No title")
-            author = getattr(pub, "bib", {}).get("author", "")
-            year = getattr(pub, "bib", {}).get("pub_year", "")
-            venue = getattr(pub, "bib", {}).get("venue", "")
-            output.append(
-                f"Title: {title}\nAuthors: {author}\nYear: {year}\nVenue: {venue}\n---"
-            )
-        if not output:
-            logging.info(f"google_scholar_tool: No articles found for query: {query}")
-            return f"No articles found for query: {query}"
-        logging.info("google_scholar_tool executed successfully")
-        return "\n".join(output)
+        result = await asyncio.wait_for(
+            asyncio.get_running_loop().run_in_executor(
+                _scholar_executor, _fetch_google_scholar, query, max_results
+            ),
+            timeout=_SCHOLAR_TIMEOUT_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        logging.error("google_scholar_tool timed out")
+        _record_scholar_failure()
+        return (
+            "Error querying Google Scholar: "
+            f"timed out after {_SCHOLAR_TIMEOUT_SECONDS} seconds"
+        )
     except Exception as e:
         logging.error(f"Error in google_scholar_tool: {e}")
+        _record_scholar_failure()
         return f"Error querying Google Scholar: {e}"
+
+    _scholar_failure_streak = 0
+    _scholar_cache[cache_key] = result
+    return result
+
+
+@tool("google_scholar_tool")
+def google_scholar_tool(query: str, max_results: int = 5) -> str:
+    """
+    Search Google Scholar for scientific articles using the scholarly library.
+    Note: Google Scholar does not provide an official public API. This tool uses the 'scholarly' Python package.
+    Args:
+        query (str): The search term or query string.
+        max_results (int): Maximum number of articles to return (default: 5).
+    Returns:
+        str: A summary of Google Scholar search results, or an error message.
+
+    Each result includes:
+        - Title
+        - Authors
+        - Year
+        - Venue
+    """
+    return _run_on_io_loop(_google_scholar_search(query, max_results)).result()
+
+
+async def google_scholar_search_async(query: str, max_results: int = 5) -> str:
+    """Awaitable google_scholar_tool, usable from any event loop."""
+    return await asyncio.wrap_future(
+        _run_on_io_loop(_google_scholar_search(query, max_results))
+    )
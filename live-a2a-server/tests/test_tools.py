@@ -0,0 +1,179 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import tools
+
+
+def test_dose_log_mean_averages_logs_per_group():
+    """Mean log dose per group, skipping unmatched rows and unusable doses."""
+    codes = np.array([0, 0, 1, -1, 1, 1], dtype=np.int64)
+    doses = np.array([2.0, 8.0, np.nan, 100.0, 0.0, -3.0])
+
+    result = tools._dose_log_mean(codes, doses, 3)
+
+    assert result[0] == pytest.approx(np.log(4.0))
+    # Only NaN, zero and negative doses: no mean
+    assert np.isnan(result[1])
+    # Group without rows
+    assert np.isnan(result[2])
+
+
+def test_count_significant_ignores_nan_and_unmatched_rows():
+    """Counts p-values strictly below the threshold per group."""
+    codes = np.array([0, 0, 0, 1, -1], dtype=np.int64)
+    p_values = np.array([0.01, 0.05, np.nan, 0.001, 0.0])
+
+    result = tools._count_significant(codes, p_values, 0.05, 3)
+
+    assert result.tolist() == [1, 1, 0]
+
+
+@pytest.mark.parametrize(
+    ("dosage", "expected"),
+    [
+        ("8 mg/kg", 8.0),
+        ("8 mg/kg/day", 8.0),
+        ("2.5 MG / KG per day", 2.5),
+        ("0.5 g/kg", 500.0),
+        ("200 µg/kg", 0.2),
+        ("200 mcg/kg daily", 0.2),
+        ("14 ppm", np.nan),
+        ("10 mg/day", np.nan),
+        ("5", np.nan),
+        ("unknown", np.nan),
+        (None, np.nan),
+    ],
+)
+def test_dose_mg_per_kg_normalizes_units(dosage, expected):
+    """Only doses convertible to mg/kg get a value."""
+    result = tools._dose_mg_per_kg(
+        pd.Series([dosage], dtype=pd.ArrowDtype(pa.string()))
+    )
+
+    np.testing.assert_allclose(result, [expected])
+
+
+def test_dose_mg_per_kg_ignores_numeric_columns():
+    """Bare numbers carry no unit, so they are never averaged."""
+    result = tools._dose_mg_per_kg(pd.Series([1.0, 2.0]))
+
+    assert np.isnan(result).all()
+
+
+def test_add_derived_columns_aggregates_per_intervention():
+    """Adds the mg/kg dose mean and evidence score to the interventions."""
+    frames = {
+        "interventions": pd.DataFrame({"id": [1, 2, 3]}),
+        "study_extractions": pd.DataFrame(
+            {
+                "intervention_id": [1, 1, 2],
+                "dosage": ["2 mg/kg", "8 mg/kg/day", "14 ppm"],
+                "p_value": [0.01, 0.2, 0.03],
+            }
+        ),
+    }
+
+    tools._add_derived_columns(frames)
+
+    interventions = frames["interventions"]
+    dose = np.exp(interventions["dose_log_mean_mg_per_kg"])
+    assert dose[0] == pytest.approx(4.0)
+    assert dose[1:].isna().all()
+    assert interventions["evidence_score"].tolist() == [1, 1, 0]
+
+
+def test_build_full_frame_returns_none_on_mismatched_keys():
+    """Join keys with different dtypes fall back to the separate frames."""
+    frames = {
+        "interventions": pd.DataFrame(
+            {"id": pd.Series(["1"], dtype=pd.ArrowDtype(pa.string())), "slug": ["a"]}
+        ),
+        "study_extractions": pd.DataFrame(
+            {
+                "intervention_id": pd.Series([1], dtype=pd.ArrowDtype(pa.int64())),
+                "study_id": [1],
+            }
+        ),
+        "studies": pd.DataFrame({"id": [1], "pmid": ["9"]}),
+    }
+
+    assert tools._build_full_frame(frames) is None
+
+
+EFETCH_XML = b"""<?xml version="1.0"?>
+<PubmedArticleSet>
+  <PubmedArticle>
+    <MedlineCitation>
+      <PMID Version="1">111</PMID>
+      <Article>
+        <Abstract>
+          <AbstractText Label="BACKGROUND">Rapamycin <i>extends</i> lifespan.</AbstractText>
+          <AbstractText Label="RESULTS">In mice.</AbstractText>
+        </Abstract>
+      </Article>
+    </MedlineCitation>
+  </PubmedArticle>
+  <PubmedArticle>
+    <MedlineCitation>
+      <PMID Version="1">222</PMID>
+      <Article/>
+    </MedlineCitation>
+  </PubmedArticle>
+  <PubmedArticle>
+    <MedlineCitation>
+      <Article/>
+    </MedlineCitation>
+  </PubmedArticle>
+</PubmedArticleSet>
+"""
+
+
+def test_parse_efetch_maps_pmids_to_abstracts():
+    """Joins abstract sections, keeps inline markup text, skips missing PMIDs."""
+    assert tools._parse_efetch(EFETCH_XML) == {
+        "111": "Rapamycin extends lifespan. In mice.",
+        "222": "",
+    }
+
+
+@pytest.fixture
+def scholar_breaker(monkeypatch):
+    """Closed Google Scholar circuit breaker with no failures recorded."""
+    monkeypatch.setattr(tools, "_scholar_failure_streak", 0)
+    monkeypatch.setattr(tools, "_scholar_streak_started_at", 0.0)
+    monkeypatch.setattr(tools, "_scholar_open_until", 0.0)
+
+
+def test_scholar_breaker_opens_after_threshold(scholar_breaker):
+    """Consecutive failures within the window open the breaker and reset the streak."""
+    for _ in range(tools._SCHOLAR_FAILURE_THRESHOLD - 1):
+        tools._record_scholar_failure()
+    assert tools._scholar_open_until == 0.0
+
+    tools._record_scholar_failure()
+
+    assert tools._scholar_open_until == pytest.approx(
+        time.time() + tools._SCHOLAR_COOLDOWN_SECONDS, abs=5
+    )
+    assert tools._scholar_failure_streak == 0
+
+
+def test_scholar_breaker_restarts_streak_after_window(scholar_breaker, monkeypatch):
+    """A failure after the window starts a new streak instead of opening."""
+    monkeypatch.setattr(
+        tools, "_scholar_failure_streak", tools._SCHOLAR_FAILURE_THRESHOLD - 1
+    )
+    monkeypatch.setattr(
+        tools,
+        "_scholar_streak_started_at",
+        time.time() - tools._SCHOLAR_FAILURE_WINDOW_SECONDS - 1,
+    )
+
+    tools._record_scholar_failure()
+
+    assert tools._scholar_failure_streak == 1
+    assert tools._scholar_open_until == 0.0